@@ -7,7 +7,13 @@
 # SPDX-License-Identifier: BSD-3-Clause
 # <<END-copyright>>
 
+import os
 import argparse
+import itertools
+import collections
+import tempfile
+import contextlib
+from concurrent import futures
 from fudge import GNDS_file
 from fudge import reactionSuite
 from fudge import styles
@@ -25,38 +31,61 @@ Sample use:
     merge_temperatures.py processed_1.xml processed_2.xml -o final_file.xml --hybrid
 """
 
+# styles.TemperatureInfo members holding the label of each processed style at a temperature:
+PROCESSED_STYLES = ('heated', 'griddedCrossSection', 'heatedMultiGroup', 'URR_probabilityTables', 'SnElasticUpScatter')
+
 def parse_args():
     parser = argparse.ArgumentParser(description)
     parser.add_argument("gndsFiles", nargs="+", help="Files to merge")
     parser.add_argument("-o", "--outputFile", required=True, help="Final merged file name")
     parser.add_argument("--hybrid", action="store_true", help="Write final file in hybrid XML/HDF5")
+    parser.add_argument("-n", "--numberOfProcesses", type=int, default=None,
+            help="Number of processes used to read the input files after the first, and to merge batches when there are more input files than --batch-size. Default is half the number of CPUs")
+    parser.add_argument("--batch-size", type=int, default=8,
+            help="Maximum number of files merged at once. More input files are merged in batches into temporary files, which are then merged")
+
+    args = parser.parse_args()
+    if args.batch_size < 2:
+        parser.error("--batch-size must be at least 2")
 
-    return parser.parse_args()
+    return args
 
 
 def copy_component(src_comp, dest_comp, toCopy):
     """ Copy all processed forms in a component like <crossSection>, <multiplicity>, etc. """
-    for key in src_comp.keys():
+    # most components have no processed forms at the temperatures being copied:
+    if not src_comp.any_keys_in(toCopy): return
+
+    # Suite.labels() also works for suites that are not components, and unlike Component.keys()
+    # it does not parse lazily parsed forms just to get their labels:
+    for key in src_comp.labels():
         if key in toCopy:
             dest_comp.add(src_comp[key])
 
 
+def clear_processing_documentation(style):
+    """ Don't repeat processing documentation for higher temps """
+    style.documentation.dates.clear()
+    style.documentation.computerCodes.clear()
+
+
 def copy_styles(src_styles, dest_styles, toCopy):
     """ Styles section requires special handling """
-    for key in src_styles.keys():
-        if key not in toCopy: continue
+    dest_lowest_temp = dest_styles.temperatures()[0]
+    transportables_href = None
+
+    for style in src_styles:
+        if style.label not in toCopy: continue
 
-        style = src_styles[key]
-        # don't repeat processing documentation for higher temps:
-        style.documentation.dates.clear()
-        style.documentation.computerCodes.clear()  
+        clear_processing_documentation(style)
 
         if isinstance(style, styles.HeatedMultiGroup):
             # replace transportables with a link to the first temperature
-            style.transportables.clear()
-            dest_lowest_temp = dest_styles.temperatures()[0]
-            # FIXME href doesn't support assignment
-            style.transportables._Suite__href = dest_styles[dest_lowest_temp.heatedMultiGroup].transportables.toXLink()
+            if transportables_href is None:
+                transportables_href = dest_styles[dest_lowest_temp.heatedMultiGroup].transportables.toXLink()
+            if style.transportables.href is None:
+                style.transportables.clear()
+            style.transportables.set_href(transportables_href)
 
         dest_styles.add(style)
 
@@ -84,8 +113,10 @@ def copy_outputChannel(src_channel, dst_channel, toCopy, fission=False):
             src_channel.fissionFragmentData.fissionEnergyReleases,
             dst_channel.fissionFragmentData.fissionEnergyReleases, toCopy)
 
+    # Suite lookup by label is a linear search, so index the destination products once:
+    dst_products = {product.label: product for product in dst_channel.products}
     for src_product in src_channel.products:
-        dst_product = dst_channel.products[src_product.label]
+        dst_product = dst_products[src_product.label]
         copy_product(src_product, dst_product, toCopy)
 
 
@@ -105,59 +136,136 @@ def copy_reaction(src_reaction, dst_reaction, toCopy):
 # --------------------------------------------------------
 # Merge multiple ReactionSuites (first file is accumulator)
 # --------------------------------------------------------
-def merge_reaction_suites(files):
-    print(f"Loading base ReactionSuite from {files[0]}")
-    base = reactionSuite.read(files[0])
-
-    for idx, fn in enumerate(files[1:]):
-        other = reactionSuite.read(fn)
-
-        print(f"Merging ReactionSuite from {fn}")
-        toCopy = set([getattr(temp, processedStyle)
-            for processedStyle in ('heated', 'griddedCrossSection', 'heatedMultiGroup', 'URR_probabilityTables', 'heatedMultiGroup', 'SnElasticUpScatter')
-            for temp in other.styles.temperatures()
-            ])
-
-        for otherStyle in toCopy:
-            if otherStyle in base.styles:
-                # FIXME should this script have an option to re-index style labels?
-                raise Exception(f"Style {otherStyle} is already present in merged file! May indicate missing or incorrect '--baseTemperatureIndex' when running processProtare!")
-
-        copy_styles(other.styles, base.styles, toCopy)
-
-        for other_rx in other.reactions:
-            base_rx = base.reactions[other_rx.label]
-            copy_reaction(other_rx, base_rx, toCopy)
-
-        for other_op in other.orphanProducts:
-            base_op = base.orphanProducts[other_op.label]
-            copy_component(other_op.crossSection, base_op.crossSection, toCopy)
-            copy_outputChannel(other_op.outputChannel, base_op.outputChannel, toCopy)
-
-        for other_crossSectionSum in other.sums.crossSectionSums:
-            base_crossSectionSum = base.sums.crossSectionSums[other_crossSectionSum.label]
-            copy_component(other_crossSectionSum.crossSection, base_crossSectionSum.crossSection, toCopy)
-
-        for other_production in other.productions:
-            base_production = base.productions[other_production.label]
-            copy_component(other_production.crossSection, base_production.crossSection, toCopy)
-            copy_component(other_production.outputChannel.Q, base_production.outputChannel.Q, toCopy)
-
-        # LLNL-specific stuff in applicationData:
-        for key, copy_method in (
-                ("LLNL::multiGroupReactions", copy_reaction),
-                ("LLNL::multiGroupDelayedNeutrons", copy_outputChannel),
-                ("LLNL::URR_probability_tables", copy_component)
-                ):
-            if key in base.applicationData:
-                for other_appData, base_appData in zip(
-                        other.applicationData[key],
-                        base.applicationData[key]):
-                    copy_method(other_appData, base_appData, toCopy)
+def merge_reaction_suites(files, numberOfProcesses=None):
+    if numberOfProcesses is None:
+        numberOfProcesses = (os.cpu_count() or 1) // 2
+    numberOfProcesses = max(1, min(len(files) - 1, numberOfProcesses))
+
+    if numberOfProcesses == 1:
+        print(f"Loading base ReactionSuite from {files[0]}")
+        base = reactionSuite.read(files[0])
+
+        for fn in files[1:]:
+            merge_reaction_suite(base, reactionSuite.stream_read(fn), fn)
+
+        return base
+
+    with futures.ProcessPoolExecutor(max_workers=numberOfProcesses) as executor:
+        # parse the other files in worker processes while the base is read and merged here:
+        # only the styles and the suites that are merged are needed from them.
+        # Each parsed suite is unpickled into this process, so only keep numberOfProcesses files in flight:
+        remaining = iter(files[1:])
+        pending = collections.deque((fn, executor.submit(reactionSuite.stream_read, fn))
+                for fn in itertools.islice(remaining, numberOfProcesses))
+
+        print(f"Loading base ReactionSuite from {files[0]}")
+        base = reactionSuite.read(files[0])
+
+        while pending:
+            fn, other = pending.popleft()
+            other = other.result()
+            for nextFn in itertools.islice(remaining, 1):
+                pending.append((nextFn, executor.submit(reactionSuite.stream_read, nextFn)))
+            merge_reaction_suite(base, other, fn)
+            del other
 
     return base
 
 
+def merge_batch(files, outputFile):
+    """ Merge *files* in this process and write the result to *outputFile* in hybrid XML/HDF5 """
+    merged = merge_reaction_suites(files, numberOfProcesses=1)
+    merged.saveAllToFile(outputFile, hybrid=True)
+    return outputFile
+
+
+def merge_in_batches(files, batchSize, workDir, numberOfProcesses=None):
+    """
+    Tree reduce *files*: merge them *batchSize* at a time into partial merges written to *workDir*, then do the same with
+    the partial merges until no more than *batchSize* files remain. Returns the remaining files, in temperature order.
+    """
+    if numberOfProcesses is None:
+        numberOfProcesses = (os.cpu_count() or 1) // 2
+
+    level = 0
+    while len(files) > batchSize:
+        batches = [files[start:start + batchSize] for start in range(0, len(files), batchSize)]
+        print(f"Merging {len(files)} files in {len(batches)} batches")
+
+        with futures.ProcessPoolExecutor(max_workers=max(1, min(len(batches), numberOfProcesses))) as executor:
+            partials = []
+            for index, batch in enumerate(batches):
+                if len(batch) == 1:
+                    partials.append(batch[0])
+                else:
+                    outputFile = os.path.join(workDir, f"merged_{level}_{index}.xml")
+                    partials.append(executor.submit(merge_batch, batch, outputFile))
+            files = [partial if isinstance(partial, str) else partial.result() for partial in partials]
+
+        level += 1
+
+    return files
+
+
+def merge_reaction_suite(base, other, fn):
+    """ Merge processed data from ReactionSuite *other*, read from file *fn*, into *base* """
+    print(f"Merging ReactionSuite from {fn}")
+    temps = list(other.styles.temperatures())
+    # an empty label means that processed style is missing at that temperature:
+    toCopy = frozenset(getattr(temp, processedStyle) for temp in temps for processedStyle in PROCESSED_STYLES) - {''}
+
+    # Suite and Styles lookups by label are linear searches, so index base once per merged file:
+    base_styles_keys = set(base.styles.keys())
+    base_reactions = {reaction.label: reaction for reaction in base.reactions}
+    base_orphans = {orphanProduct.label: orphanProduct for orphanProduct in base.orphanProducts}
+    base_css = {crossSectionSum.label: crossSectionSum for crossSectionSum in base.sums.crossSectionSums}
+    base_prods = {production.label: production for production in base.productions}
+    base_app_keys = set(base.applicationData.labels())
+
+    clash = toCopy & base_styles_keys
+    if clash:
+        # FIXME should this script have an option to re-index style labels?
+        raise Exception(f"Style(s) {sorted(clash)} already present in merged file! May indicate missing or incorrect '--baseTemperatureIndex' when running processProtare!")
+
+    copy_styles(other.styles, base.styles, toCopy)
+
+    for other_rx in other.reactions:
+        base_rx = base_reactions[other_rx.label]
+        copy_reaction(other_rx, base_rx, toCopy)
+
+    for other_op in other.orphanProducts:
+        base_op = base_orphans[other_op.label]
+        copy_component(other_op.crossSection, base_op.crossSection, toCopy)
+        copy_outputChannel(other_op.outputChannel, base_op.outputChannel, toCopy)
+
+    for other_crossSectionSum in other.sums.crossSectionSums:
+        base_crossSectionSum = base_css[other_crossSectionSum.label]
+        copy_component(other_crossSectionSum.crossSection, base_crossSectionSum.crossSection, toCopy)
+
+    for other_production in other.productions:
+        base_production = base_prods[other_production.label]
+        copy_component(other_production.crossSection, base_production.crossSection, toCopy)
+        copy_component(other_production.outputChannel.Q, base_production.outputChannel.Q, toCopy)
+
+    # LLNL-specific stuff in applicationData:
+    base_app = base.applicationData
+    other_app = other.applicationData
+    for key, copy_method in (
+            ("LLNL::multiGroupReactions", copy_reaction),
+            ("LLNL::multiGroupDelayedNeutrons", copy_outputChannel),
+            ("LLNL::URR_probability_tables", copy_component)
+            ):
+        if key not in base_app_keys: continue
+
+        base_data = base_app[key].data
+        other_data = other_app[key].data
+        # entries are matched by position, so a different count means they do not correspond:
+        if len(other_data) != len(base_data):
+            raise Exception(f"applicationData '{key}' has {len(other_data)} entries in {fn} but {len(base_data)} in merged file!")
+        for other_appData, base_appData in zip(other_data, base_data):
+            copy_method(other_appData, base_appData, toCopy)
+
+
 if __name__ == "__main__":
     args = parse_args()
 
@@ -169,18 +277,33 @@ if __name__ == "__main__":
             raise Exception(f"Error! {field} must match for all input files, but found multiple values: {field_values}")
 
     first_temperatures = [f.styles.temperatures()[0].temperature for f in previews]
-    # sort by temperature
-    first_temperatures, previews, gndsFiles = zip(*sorted(zip(first_temperatures, previews, args.gndsFiles)))
+    # sort by temperature (sorting indices never compares the previews themselves when temperatures tie):
+    order = sorted(range(len(first_temperatures)), key=first_temperatures.__getitem__)
+    previews = [previews[i] for i in order]
+    gndsFiles = [args.gndsFiles[i] for i in order]
 
     # temperatures must be increasing monotonically:
-    all_temps = [t.temperature for preview in previews for t in preview.styles.temperatures()]
-    if all_temps != sorted(all_temps):
-        raise Exception(f"Error! Temperatures were out of order! {all_temps}")
-
-    print(f"Merging {len(all_temps)} temperatures from {len(gndsFiles)} files")
-    merged = merge_reaction_suites(gndsFiles)
-
-
-    print(f"\nWriting merged ReactionSuite to {args.outputFile}")
-    merged.saveAllToFile(args.outputFile, hybrid=args.hybrid)
+    numberOfTemperatures = 0
+    previous = float('-inf')
+    for gndsFile, preview in zip(gndsFiles, previews):
+        for temp in preview.styles.temperatures():
+            if temp.temperature <= previous:
+                raise Exception(f"Error! Temperatures were out of order! {temp.temperature} in {gndsFile} does not exceed {previous}")
+            previous = temp.temperature
+            numberOfTemperatures += 1
+
+    del previews    # only the file names are needed from here on
+
+    print(f"Merging {numberOfTemperatures} temperatures from {len(gndsFiles)} files")
+    with contextlib.ExitStack() as stack:
+        if len(gndsFiles) > args.batch_size:
+            # partial merges must outlive the final write, which loads the covariances next to the first one:
+            outputDir = os.path.dirname(os.path.abspath(args.outputFile))
+            os.makedirs(outputDir, exist_ok=True)
+            workDir = stack.enter_context(tempfile.TemporaryDirectory(prefix="merge_temperatures_", dir=outputDir))
+            gndsFiles = merge_in_batches(gndsFiles, args.batch_size, workDir, args.numberOfProcesses)
+        merged = merge_reaction_suites(gndsFiles, args.numberOfProcesses)
+
+        print(f"\nWriting merged ReactionSuite to {args.outputFile}")
+        merged.saveAllToFile(args.outputFile, hybrid=args.hybrid)
 
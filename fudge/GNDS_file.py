@@ -158,41 +158,6 @@ def read(fileName, reactionSuite=None, warningNoReactionSuite=True, verbosity=1,
         raise ImportError('Cannot open HDF5 file as h5py module not available.')
 
 
-class GNDSTypeHandlerPreview(xml.sax.handler.ContentHandler):
-    """For internal use. The SAX handler used to determine the *GNDS/XML* file type."""
-
-    def __init__(self, rootMoniker, parser, childMonikers):
-
-        xml.sax.handler.ContentHandler.__init__(self)
-
-        self.parser = parser
-        self.childMonikers = childMonikers
-        self.GNDS_level = 0
-        self.rootMoniker = rootMoniker
-        self.haltParsingMoniker = rootMoniker
-        self.GNDS_previewLine = -1
-        self.GNDS_previewColumn = None
-
-    def startElement(self, name, attributes):
-
-        if self.GNDS_level == 1:
-            if name not in self.childMonikers:
-                if self.GNDS_previewLine == -1:
-                    self.GNDS_previewColumn = self.parser.getColumnNumber()
-                    self.GNDS_previewLine = self.parser.getLineNumber()
-                raise GNDSTypeException()
-        self.GNDS_level += 1
-
-    def endElement(self, name):
-
-        self.haltParsingMoniker = name
-        self.GNDS_previewColumn = self.parser.getColumnNumber()
-        self.GNDS_previewLine = self.parser.getLineNumber()
-        self.GNDS_level -= 1
-
-        if name == self.rootMoniker:
-            raise GNDSTypeException()
-
 def preview(fileName, haltParsingMoniker=stylesModule.Styles.moniker):
     """
     Returns a GNDS reactionSuite or covarianceSuite instance that only contains the child nodes up to and including the child
@@ -218,36 +183,35 @@ def preview(fileName, haltParsingMoniker=stylesModule.Styles.moniker):
             raise ValueError('Invalid haltParsingMoniker = "%s".' % haltParsingMoniker)
         childMonikers = childNodeOrder[:childNodeOrder.index(haltParsingMoniker) + 1]
 
-    parser = xml.sax.make_parser()
-    handler = GNDSTypeHandlerPreview(name, parser, childMonikers)
-    parser.setContentHandler(handler)
-
-    try:
-        parser.parse(fileName)
-
-    except GNDSTypeException:
-        lines = []
-        with open(fileName) as fIn:
-            for index in range(handler.GNDS_previewLine): lines.append(fIn.readline())
-
-        lines.append(lines.pop(-1)[:handler.GNDS_previewColumn] + '</%s>' % handler.haltParsingMoniker)
-        if handler.haltParsingMoniker != name: lines.append('</%s>' % name)
-
-        element = ElementTree.fromstring(''.join(lines))
-        element = xmlNodeModule.XML_node(element, xmlNodeModule.XML_node.etree)
-        linkData = {'unresolvedLinks': []}
-        if name == reactionSuiteModule.ReactionSuite.moniker:
-            reactionSuite = reactionSuiteModule.ReactionSuite.parseNodeUsingClass(element, [], linkData,
-                                                                                  sourcePath=fileName,
-                                                                                  numberOfBrokenLinksToPrint=0)
-            if ((reactionSuite.format == GNDS_formatVersionModule.version_1_10) and (
-                    haltParsingMoniker == suitesModule.ExternalFiles.moniker)):
-                if len(reactionSuite.externalFiles) == 0:
-                    # Some older files had the externalFiles node after the styles node.
-                    reactionSuite2 = preview(fileName)
-                    if len(reactionSuite2.externalFiles) > 0:
-                        reactionSuite = reactionSuite2
-                        while len(reactionSuite.styles) > 0: reactionSuite.styles.remove(reactionSuite.styles[0])
-            return reactionSuite
-        else:
-            return covarianceSuiteModule.CovarianceSuite.parseNodeUsingClass(element, [], linkData, sourcePath=fileName)
+    root = None
+    level = 0
+    with open(fileName, 'rb') as fIn:
+        for event, element in ElementTree.iterparse(fIn, events=('start', 'end')):
+            if event == 'start':
+                if level == 0:
+                    root = element
+                elif level == 1 and element.tag not in childMonikers:
+                    # iterparse reads ahead so element and siblings after it may already be attached to root.
+                    del root[list(root).index(element):]
+                    break
+                level += 1
+            else:
+                level -= 1
+
+    element = xmlNodeModule.XML_node(root, xmlNodeModule.XML_node.etree)
+    linkData = {'unresolvedLinks': []}
+    if name == reactionSuiteModule.ReactionSuite.moniker:
+        reactionSuite = reactionSuiteModule.ReactionSuite.parseNodeUsingClass(element, [], linkData,
+                                                                              sourcePath=fileName,
+                                                                              numberOfBrokenLinksToPrint=0)
+        if ((reactionSuite.format == GNDS_formatVersionModule.version_1_10) and (
+                haltParsingMoniker == suitesModule.ExternalFiles.moniker)):
+            if len(reactionSuite.externalFiles) == 0:
+                # Some older files had the externalFiles node after the styles node.
+                reactionSuite2 = preview(fileName)
+                if len(reactionSuite2.externalFiles) > 0:
+                    reactionSuite = reactionSuite2
+                    while len(reactionSuite.styles) > 0: reactionSuite.styles.remove(reactionSuite.styles[0])
+        return reactionSuite
+    else:
+        return covarianceSuiteModule.CovarianceSuite.parseNodeUsingClass(element, [], linkData, sourcePath=fileName)
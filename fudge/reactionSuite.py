@@ -17,10 +17,12 @@ import copy
 
 import pathlib
 import numpy
+from xml.etree import ElementTree
 
 from pqu import PQU as PQUModule
 
 from LUPY import ancestry as ancestryModule
+from LUPY import xmlNode as xmlNodeModule
 from LUPY.hdf5 import HDF5_present, h5py
 from fudge import GNDS_formatVersion as GNDS_formatVersionModule
 from LUPY import checksums as checksumsModule
@@ -106,6 +108,11 @@ class ReactionSuite(ancestryModule.AncestryIO):
                                                         suitesModule.FissionComponents.moniker,             suitesModule.Productions.moniker,
                                                         suitesModule.IncompleteReactions.moniker,           suitesModule.ApplicationData.moniker)}
 
+    streamReadMembers = (stylesModule.Styles.moniker, resonancesModule.Resonances.moniker, suitesModule.Reactions.moniker,
+                         suitesModule.OrphanProducts.moniker, sumsModule.Sums.moniker, suitesModule.Productions.moniker,
+                         suitesModule.ApplicationData.moniker)
+    """Default child nodes read by :py:func:`ReactionSuite.stream_read`. The resonances node is kept since reactions link to it."""
+
     def __init__(self, projectile, target, evaluation, interaction=None, formatVersion=GNDS_formatVersionModule.default,
                  style=None, projectileFrame=xDataEnumsModule.Frame.lab, MAT=None, PoPs=None, sourcePath=None):
         """
@@ -2637,6 +2644,69 @@ class ReactionSuite(ancestryModule.AncestryIO):
 
         return ReactionSuite.readXML_file(fileName, **kwargs)
 
+    @staticmethod
+    def stream_read(fileName, keep=streamReadMembers, **kwargs):
+        """
+        Reads in the file name *fileName* and returns a **ReactionSuite** instance that only contains the child nodes whose
+        moniker is in *keep*. The file is parsed by :py:func:`ReactionSuite.read_from_buffer`.
+
+        :param fileName:    The name of the file to read.
+        :param keep:        The monikers of the child nodes of the reactionSuite node to read.
+        :param kwargs:      Additional key-word arguments that are passed to **parseNodeUsingClass**.
+
+        :return:            A **ReactionSuite** instance.
+        """
+
+        if isinstance(fileName, pathlib.Path):
+            fileName = str(fileName)
+        if not isinstance(fileName, str): raise TypeError('Invalid file name.')
+
+        with open(fileName, 'rb') as fIn:
+            return ReactionSuite.read_from_buffer(fIn, fileName, keep=keep, **kwargs)
+
+    @staticmethod
+    def read_from_buffer(buffer, sourcePath, keep=streamReadMembers, **kwargs):
+        """
+        Parses the GNDS/XML in the binary file like object *buffer* (e.g., an opened file or an io.BytesIO instance) and
+        returns a **ReactionSuite** instance that only contains the child nodes whose moniker is in *keep*. The "externalFiles"
+        and "styles" child nodes are always read. The XML is parsed incrementally with ElementTree.iterparse and each child
+        node of the reactionSuite node not in *keep* is discarded as soon as its end tag is read. The kept nodes are held
+        in full until they are parsed, so for a processed file, whose size is mostly in the reactions, the peak memory use
+        and time are about those of :py:func:`ReactionSuite.read`. Links into a discarded node cannot be resolved, so the
+        returned instance is only useful for reading data from the kept nodes.
+
+        :param buffer:          The file like object to read the XML from.
+        :param sourcePath:      The path of the file *buffer* contains. Relative paths in the file (e.g., to an HDF5 file) are relative to it.
+        :param keep:            The monikers of the child nodes of the reactionSuite node to read.
+        :param kwargs:          Additional key-word arguments that are passed to **parseNodeUsingClass**.
+
+        :return:                A **ReactionSuite** instance.
+        """
+
+        keep = set(keep) | set([suitesModule.ExternalFiles.moniker, stylesModule.Styles.moniker])
+
+        root = None
+        level = 0
+        for event, element in ElementTree.iterparse(buffer, events=('start', 'end')):
+            if event == 'start':
+                if root is None: root = element
+                level += 1
+            else:
+                level -= 1
+                if level == 1 and element.tag not in keep:
+                    element.clear()
+                    root.remove(element)
+
+        node = xmlNodeModule.XML_node(root, xmlNodeModule.XML_node.etree)
+        if node.tag != ReactionSuite.moniker:
+            raise ValueError('Node name "%s" in XML not the same as requested class moniker "%s".' % (node.tag, ReactionSuite.moniker))
+
+        kwargs['sourcePath'] = str(sourcePath)
+        instance = ReactionSuite.parseNodeUsingClass(node, [], {}, **kwargs)
+        instance.parseCleanup(node, **kwargs)
+
+        return instance
+
 def read(fileName, **kwargs):
     """
     Reads in the file name *fileName* and returns a **ReactionSuite** instance.
@@ -2644,6 +2714,14 @@ def read(fileName, **kwargs):
 
     return ReactionSuite.read(fileName, **kwargs)
 
+def stream_read(fileName, keep=ReactionSuite.streamReadMembers, **kwargs):
+    """
+    Reads in the file name *fileName* and returns a **ReactionSuite** instance that only contains the child nodes whose
+    moniker is in *keep*. See :py:func:`ReactionSuite.stream_read` for more details.
+    """
+
+    return ReactionSuite.stream_read(fileName, keep=keep, **kwargs)
+
 def niceSortOfMTs(MTs, verbose = 0, logFile=sys.stderr):
     '''
     Sorts the list of ENDF MTs into a sensible, defined order.
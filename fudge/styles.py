@@ -46,6 +46,8 @@ class TemperatureInfo:
     present, its label will be an empty string.
     """
 
+    __slots__ = [ 'temperature', 'heated', 'griddedCrossSection', 'URR_probabilityTables', 'heatedMultiGroup', 'SnElasticUpScatter' ]
+
     def __init__(self, temperature, heated, griddedCrossSection, URR_probabilityTables, heatedMultiGroup, SnElasticUpScatter):
         """
         :temperature:               The temperature of the data represented by the labels.
@@ -214,6 +214,18 @@ class Suite(ancestryModule.AncestryIO_bare, abc.ABC):
 
         return numberOfFixes
 
+    def any_keys_in( self, labels ) :
+        """
+        Returns True if the label of any item in self is in *labels* and False otherwise. Stops at the first match.
+        """
+
+        hrefInstance = self.hrefInstance( )
+        if( hrefInstance is not None ) : return( hrefInstance.any_keys_in( labels ) )
+
+        for item in self.__items :
+            if( item.label in labels ) : return( True )
+        return( False )
+
     def hrefInstance( self ) :
 
         if( self.__hrefInstance is None ) :
@@ -230,6 +242,7 @@ class Suite(ancestryModule.AncestryIO_bare, abc.ABC):
         if( not( isinstance( href, str ) ) ) : raise ValueError( 'href instance must be a string.' )
 
         self.__href = href
+        self.__hrefInstance = None                  # Any previously followed href is stale.
 
     def pop( self, label, *args ) :
         """
@@ -0,0 +1,6 @@
+# <<BEGIN-copyright>>
+# Copyright 2022, Lawrence Livermore National Security, LLC.
+# See the top-level COPYRIGHT file for details.
+# 
+# SPDX-License-Identifier: BSD-3-Clause
+# <<END-copyright>>
@@ -0,0 +1,183 @@
+# <<BEGIN-copyright>>
+# Copyright 2022, Lawrence Livermore National Security, LLC.
+# See the top-level COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+# <<END-copyright>>
+
+"""
+test bin/merge_temperatures.py on small processed files.
+"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+import contextlib
+import subprocess
+import importlib.util
+
+from LUPY.hdf5 import HDF5_present
+from fudge import reactionSuite as reactionSuiteModule
+
+repositoryPath = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+scriptPath = os.path.join(repositoryPath, 'bin', 'merge_temperatures.py')
+
+spec = importlib.util.spec_from_file_location('merge_temperatures', scriptPath)
+mergeTemperaturesModule = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(mergeTemperaturesModule)
+
+def XYs1d(label, value):
+
+    return '''        <XYs1d label="%s">
+          <axes>
+            <axis index="1" label="energy_in" unit="eV"/>
+            <axis index="0" label="crossSection" unit="b"/></axes>
+          <values>1e-5 %s 2e7 %s</values></XYs1d>''' % (label, value, value)
+
+def processedXML(temperatures, startIndex=0, numberOfMultiGroupReactions=1):
+    """
+    Returns the XML of a reactionSuite processed at each temperature in *temperatures* (in K). The processed styles are
+    labelled like processProtare.py does with '--baseTemperatureIndex startIndex'. As in processed files, each
+    heatedMultiGroup style after the first links its transportables to those of the first.
+    """
+
+    labels = [ '%03d' % (startIndex + i1) for i1 in range(len(temperatures)) ]
+
+    styles = []
+    for label, temperature in zip(labels, temperatures):
+        if label == labels[0]:
+            transportables = '''      <transportables>
+        <transportable label="n" conserve="number">
+          <group label="LLNL_gid_7">
+            <grid index="0" label="energy" unit="MeV" style="boundaries">
+              <values>1e-11 1 20</values></grid></group></transportable></transportables>'''
+        else:
+            transportables = '''      <transportables href="/reactionSuite/styles/heatedMultiGroup[@label='MultiGroup_%s']/transportables"/>''' % labels[0]
+        styles.append('''    <heated label="heated_%s" derivedFrom="eval" date="2020-01-01">
+      <temperature value="%s" unit="K"/></heated>
+    <heatedMultiGroup label="MultiGroup_%s" derivedFrom="heated_%s" date="2020-01-01">
+%s
+      <flux label="LLNL_fid_1">
+        <XYs2d>
+          <axes>
+            <axis index="2" label="energy_in" unit="MeV"/>
+            <axis index="1" label="mu" unit=""/>
+            <axis index="0" label="flux" unit="1/s"/></axes>
+          <function1ds>
+            <Legendre outerDomainValue="0"><values>1</values></Legendre>
+            <Legendre outerDomainValue="20"><values>1</values></Legendre></function1ds></XYs2d></flux></heatedMultiGroup>'''
+                % (label, temperature, label, label, transportables))
+
+    forms = '\n'.join([ XYs1d('heated_%s' % label, temperature) for label, temperature in zip(labels, temperatures) ])
+    multiGroupReactions = '\n'.join([ '''      <reaction label="reaction %d" ENDF_MT="%d">
+        <crossSection>
+%s</crossSection>
+        <outputChannel genre="NBody"/></reaction>''' % (i1, i1 + 1, forms) for i1 in range(numberOfMultiGroupReactions) ])
+
+    return '''<?xml version="1.0" encoding="UTF-8"?>
+<reactionSuite projectile="n" target="H1" evaluation="test" format="2.0" projectileFrame="lab" interaction="nuclear">
+  <styles>
+    <evaluated label="eval" date="2020-01-01" library="test" version="1.0">
+      <temperature value="0" unit="K"/>
+      <projectileEnergyDomain min="1e-5" max="2e7" unit="eV"/></evaluated>
+%s</styles>
+  <PoPs name="protare_internal" version="1.0" format="2.0"/>
+  <reactions>
+    <reaction label="n + H1" ENDF_MT="2">
+      <crossSection>
+%s
+%s</crossSection>
+      <outputChannel genre="twoBody">
+        <Q>
+          <constant1d label="eval" value="0" domainMin="1e-5" domainMax="2e7">
+            <axes>
+              <axis index="1" label="energy_in" unit="eV"/>
+              <axis index="0" label="Q" unit="eV"/></axes></constant1d></Q>
+        <products/></outputChannel></reaction></reactions>
+  <applicationData>
+    <institution label="LLNL::multiGroupReactions">
+%s</institution></applicationData></reactionSuite>
+''' % ('\n'.join(styles), XYs1d('eval', 20), forms, multiGroupReactions)
+
+class TestMergeTemperatures(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def writeProcessed(self, name, temperatures, startIndex=0, **kwargs):
+
+        fileName = os.path.join(self.directory.name, name)
+        with open(fileName, 'w') as fOut: fOut.write(processedXML(temperatures, startIndex, **kwargs))
+        return fileName
+
+    def merge(self, files):
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            return mergeTemperaturesModule.merge_reaction_suites(files, numberOfProcesses=1)
+
+    def runScript(self, *args):
+
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join([ repositoryPath ] + [ path for path in [ env.get('PYTHONPATH') ] if path ])
+        return subprocess.run([ sys.executable, scriptPath ] + list(args) + [ '-n', '1' ], env=env,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+
+    def test_multipleTemperaturesPerFile(self):
+
+        files = [ self.writeProcessed('first.xml', [ 300, 600 ]), self.writeProcessed('second.xml', [ 900, 1200 ], 2) ]
+        merged = self.merge(files)
+
+        self.assertEqual(list(merged.styles.keys()), [ 'eval' ] +
+                [ '%s_%03d' % (prefix, i1) for i1 in range(4) for prefix in ('heated', 'MultiGroup') ])
+        self.assertEqual(merged.reactions[0].crossSection.labels(), [ 'eval', 'heated_000', 'heated_001', 'heated_002', 'heated_003' ])
+        self.assertEqual(merged.applicationData['LLNL::multiGroupReactions'].data[0].crossSection.labels(),
+                [ 'heated_000', 'heated_001', 'heated_002', 'heated_003' ])
+
+        firstTransportables = merged.styles['MultiGroup_000'].transportables
+        for label in ('MultiGroup_001', 'MultiGroup_002', 'MultiGroup_003'):
+            self.assertEqual(merged.styles[label].transportables.href, firstTransportables.toXLink())
+
+        outputFile = os.path.join(self.directory.name, 'merged.xml')
+        merged.saveToFile(outputFile)
+        merged = reactionSuiteModule.read(outputFile)
+        for label in ('MultiGroup_001', 'MultiGroup_002', 'MultiGroup_003'):         # The links must resolve in the merged file.
+            self.assertEqual(merged.styles[label].transportables.labels(), [ 'n' ])
+
+    def test_equalFirstTemperatures(self):
+
+        files = [ self.writeProcessed('first.xml', [ 300, 600 ]), self.writeProcessed('second.xml', [ 300, 450 ], 2) ]
+        result = self.runScript(*files, '-o', os.path.join(self.directory.name, 'merged.xml'))
+
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn('Temperatures were out of order!', result.stderr)
+        self.assertNotIn('TypeError', result.stderr)             # Ties must not fall through to comparing the previews.
+
+    def test_LLNL_entryCountMismatch(self):
+
+        files = [ self.writeProcessed('first.xml', [ 300 ]), self.writeProcessed('second.xml', [ 600 ], 1, numberOfMultiGroupReactions=2) ]
+        with self.assertRaisesRegex(Exception, "'LLNL::multiGroupReactions' has 2 entries in .*second.xml but 1 in merged file"):
+            self.merge(files)
+
+    @unittest.skipUnless(HDF5_present, 'h5py not installed')              # Partial merges are written in hybrid XML/HDF5.
+    def test_batchedMatchesUnbatched(self):
+
+        files = [ self.writeProcessed('first.xml', [ 300, 600 ]), self.writeProcessed('second.xml', [ 900, 1200 ], 2),
+                  self.writeProcessed('third.xml', [ 1500 ], 4) ]
+        outputs = []
+        for name, batchSize in (('unbatched', '8'), ('batched', '2')):
+            outputFile = os.path.join(self.directory.name, name, 'merged.xml')
+            result = self.runScript(*files, '-o', outputFile, '--batch-size', batchSize)
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertEqual('in 2 batches' in result.stdout, name == 'batched')
+            self.assertEqual(os.listdir(os.path.dirname(outputFile)), [ 'merged.xml' ])       # The partial merges are removed.
+            with open(outputFile) as fIn: outputs.append(fIn.read())
+
+        self.assertEqual(outputs[0], outputs[1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+# <<BEGIN-copyright>>
+# Copyright 2022, Lawrence Livermore National Security, LLC.
+# See the top-level COPYRIGHT file for details.
+# 
+# SPDX-License-Identifier: BSD-3-Clause
+# <<END-copyright>>
+
+"""
+test fudge/reactionSuite.py stream_read and read_from_buffer.
+"""
+
+import io
+import os
+import tempfile
+import unittest
+import contextlib
+
+from fudge import reactionSuite as reactionSuiteModule
+
+XML = b'''<?xml version="1.0" encoding="UTF-8"?>
+<reactionSuite projectile="n" target="H1" evaluation="test" format="2.0" projectileFrame="lab" interaction="nuclear">
+  <styles>
+    <evaluated label="eval" date="2020-01-01" library="test" version="1.0">
+      <temperature value="0" unit="K"/>
+      <projectileEnergyDomain min="1e-5" max="2e7" unit="eV"/></evaluated></styles>
+  <PoPs name="protare_internal" version="1.0" format="2.0">
+    <aliases>
+      <alias id="d" pid="h2"/></aliases></PoPs>
+  <resonances>
+    <scatteringRadius>
+      <constant1d label="eval" value="12.76553" domainMin="1e-5" domainMax="1e5">
+        <axes>
+          <axis index="1" label="energy_in" unit="eV"/>
+          <axis index="0" label="radius" unit="fm"/></axes></constant1d></scatteringRadius></resonances>
+  <reactions>
+    <reaction label="n + H1" ENDF_MT="2">
+      <crossSection>
+        <resonancesWithBackground label="eval">
+          <resonances href="/reactionSuite/resonances"/>
+          <background>
+            <fastRegion>
+              <XYs1d>
+                <axes>
+                  <axis index="1" label="energy_in" unit="eV"/>
+                  <axis index="0" label="crossSection" unit="b"/></axes>
+                <values>1e-5 20 2e7 0.5</values></XYs1d></fastRegion></background></resonancesWithBackground></crossSection>
+      <outputChannel genre="twoBody">
+        <Q>
+          <constant1d label="eval" value="0" domainMin="1e-5" domainMax="2e7">
+            <axes>
+              <axis index="1" label="energy_in" unit="eV"/>
+              <axis index="0" label="Q" unit="eV"/></axes></constant1d></Q>
+        <products/></outputChannel></reaction></reactions></reactionSuite>
+'''
+
+class TestStreamRead(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.fileName = tempfile.mkstemp(suffix='.xml')
+        with os.fdopen(fd, 'wb') as fOut: fOut.write(XML)
+
+    def tearDown(self):
+        os.remove(self.fileName)
+
+    def test_stream_read(self):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            reactionSuite = reactionSuiteModule.stream_read(self.fileName)
+        self.assertEqual(stdout.getvalue(), '')         # Links into the resonances node must resolve.
+
+        self.assertEqual(list(reactionSuite.styles.keys()), ['eval'])
+        self.assertEqual(reactionSuite.reactions.labels(), ['n + H1'])
+        crossSection = reactionSuite.reactions[0].crossSection['eval']
+        self.assertIs(crossSection.resonances.link, reactionSuite.resonances)
+        self.assertNotIn('d', reactionSuite.PoPs)
+        self.assertIn('d', reactionSuiteModule.read(self.fileName).PoPs)
+
+    def test_read_from_buffer(self):
+        reactionSuite = reactionSuiteModule.ReactionSuite.read_from_buffer(io.BytesIO(XML), self.fileName, keep=())
+        self.assertEqual(list(reactionSuite.styles.keys()), ['eval'])     # The styles node is always read.
+        self.assertEqual(len(reactionSuite.reactions), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+# <<BEGIN-copyright>>
+# Copyright 2022, Lawrence Livermore National Security, LLC.
+# See the top-level COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+# <<END-copyright>>
+
+"""
+test xData/values.py HDF5 round trips.
+"""
+
+import os
+import tempfile
+import unittest
+from xml.etree import ElementTree as parser
+
+import numpy
+
+from LUPY.hdf5 import HDF5_present, h5py
+from xData import enums as enumsModule
+from xData import values as valuesModule
+
+def writeHDF(fileName, valuesList, flatten):
+    """Writes each Values in *valuesList* to HDF5 file *fileName* and returns their XML."""
+
+    with h5py.File(fileName, 'w') as h5:
+        HDF_opts = { 'h5file': h5, 'index': 0, 'minLength': 3, 'flatten': flatten, 'iData': [], 'dData': [], 'compression': {} }
+        XMLs = [ '\n'.join(values.toXML_strList(HDF_opts=HDF_opts)) for values in valuesList ]
+        if len(HDF_opts['iData']) > 0: h5.create_dataset('iData', data=numpy.array(HDF_opts['iData'], dtype=numpy.int32))
+        if len(HDF_opts['dData']) > 0: h5.create_dataset('dData', data=numpy.array(HDF_opts['dData'], dtype=numpy.float64))
+
+    return XMLs
+
+def readHDF(fileName, XML):
+
+    with h5py.File(fileName, 'r') as h5:
+        return valuesModule.Values.parseNodeUsingClass(parser.fromstring(XML), [], { 'HDF': { 'h5File': h5 } })
+
+@unittest.skipUnless(HDF5_present, 'h5py not installed')
+class TestValuesHDF(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.fileName = os.path.join(self.directory.name, 'values.h5')
+        self.valuesList = [ valuesModule.Values([ 1.5, 2.25, 3.125, 4.0625 ]),
+                            valuesModule.Values([ 3, 1, 4, 1, 5 ], valueType=enumsModule.ValueType.integer32),
+                            valuesModule.Values([ 0.5, 0.25 ]),                         # Shorter than minLength, so kept in the XML.
+                            valuesModule.Values([ 6.0, 7.0, 8.0 ]) ]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def checkRoundTrip(self, flatten):
+
+        XMLs = writeHDF(self.fileName, self.valuesList, flatten)
+        self.assertNotIn('href', XMLs[2])
+        for values, XML in zip(self.valuesList, XMLs):
+            values2 = readHDF(self.fileName, XML)
+            self.assertEqual(values2.values, values.values)
+            self.assertEqual(values2.valueType, values.valueType)
+
+    def test_flattened(self):
+        self.checkRoundTrip(True)
+        with h5py.File(self.fileName, 'r') as h5:
+            self.assertEqual(len(h5['dData']), 7)
+            self.assertEqual(len(h5['iData']), 5)
+
+    def test_notFlattened(self):
+        self.checkRoundTrip(False)
+        with h5py.File(self.fileName, 'r') as h5:
+            self.assertEqual(sorted(h5.keys()), [ 'data0', 'data1', 'data2' ])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -252,13 +252,13 @@ class Values(baseModule.XDataCoreMembers):
                     datasetName = 'dData'
                 flatData = HDF_opts[datasetName]
                 startLength = len(flatData)
-                flatData.extend(list(self))
+                flatData.extend(self.__values)      # Not list(self), which calls __getitem__ once per value.
                 XML_strList = ['%s<%s href="HDF#/%s" %s="%d" count="%d"%s/>' %
                         (indent, self.moniker, datasetName, startIndexName, startLength, len(self), attributeStr)]
             else:
                 datasetName = "data%d" % HDF_opts['index']
                 HDF_opts['index'] += 1
-                HDF_opts['h5file'].create_dataset(datasetName, data=list(self), **HDF_opts['compression'])
+                HDF_opts['h5file'].create_dataset(datasetName, data=list(self.__values), **HDF_opts['compression'])
                 XML_strList = ['%s<%s href="HDF#/%s"%s/>' % (indent, self.moniker, datasetName, attributeStr)]
         else:
             XML_strList = [ '%s<%s%s>' % ( indent, self.moniker, attributeStr ) ]
@@ -270,13 +270,11 @@ class Values(baseModule.XDataCoreMembers):
                 strList.append(' '.join(line))
             else:
                 dataToString = kwargs.get('dataToString', None)
-                if dataToString is None:
-                    for index, value in enumerate(self.__values):
-                        if ( index % valuesPerLine ) == 0:
-                            if line is not None: strList.append(' '.join(line))
-                            line = []
-                        line.append(valueFormatter(value, significantDigits = significantDigits))
-                    if line is not None and len(line) > 0: strList.append(' '.join(line))
+                if dataToString is None:                # Format one line per slice, the per-value work is then only the C formatter call.
+                    values = self.__values
+                    for start in range(0, len(values), valuesPerLine):
+                        strList.append(' '.join([valueFormatter(value, significantDigits = significantDigits)
+                                for value in values[start:start+valuesPerLine]]))
                 else:
                     kwargs['valueFormatter'] = valueFormatter
                     XML_strList += kwargs['dataToString'](self, kwargs['dataToStringParent'], indent = indent2, **kwargs)